@@ -1,6 +1,8 @@
 import cv2
+import time
 import logging
 import sys
+import numpy as np
 from pathlib import Path
 
 # Add src to Python path
@@ -8,6 +10,20 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from src.client.inference_client import InferenceClient
 
+# Seconds between re-rendering the metrics overlay
+OVERLAY_INTERVAL = 1.0
+
+def render_metrics_overlay(metrics, width):
+    """Render metrics text into an overlay image and the mask of its text pixels."""
+    overlay = np.zeros((20 * len(metrics) + 15, width, 3), dtype=np.uint8)
+    y_pos = 30
+    for key, value in metrics.items():
+        text = f"{key}: {value}"
+        cv2.putText(overlay, text, (10, y_pos), 
+                  cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+        y_pos += 20
+    return overlay, overlay.any(axis=2)
+
 def main():
     # Set up logging
     logging.basicConfig(level=logging.INFO)
@@ -27,6 +43,9 @@ def main():
     
     print("Press 'q' to quit")
     
+    overlay, overlay_mask = None, None
+    last_overlay_ts = 0.0
+    
     try:
         while True:
             # Process a frame
@@ -35,16 +54,18 @@ def main():
                 print("Failed to process frame")
                 break
             
-            # Get current metrics
-            metrics = client.get_metrics()
-            if metrics:
-                # Display metrics on frame
-                y_pos = 30
-                for key, value in metrics.items():
-                    text = f"{key}: {value}"
-                    cv2.putText(frame, text, (10, y_pos), 
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-                    y_pos += 20
+            # Re-render the metrics overlay once per interval rather than every frame
+            if time.time() - last_overlay_ts > OVERLAY_INTERVAL:
+                metrics = client.get_metrics()
+                if metrics:
+                    overlay, overlay_mask = render_metrics_overlay(metrics, frame.shape[1])
+                    last_overlay_ts = time.time()
+            
+            # Display metrics on frame by copying only the text pixels
+            if overlay is not None:
+                h = min(overlay.shape[0], frame.shape[0])
+                w = min(overlay.shape[1], frame.shape[1])
+                np.copyto(frame[:h, :w], overlay[:h, :w], where=overlay_mask[:h, :w, None])
             
             # Display the frame
             cv2.imshow('Inference Stream', frame)
@@ -1,10 +1,29 @@
 import cv2
+import queue
 import logging
+import threading
+import numpy as np
 from typing import Optional, Tuple, Dict
 from .video_capture import VideoCapture
 from .udp_client import UDPClient
 from ..utils.prediction_handler import PredictionHandler
 
+# Frames buffered between pipeline stages; older frames are dropped when full
+PIPELINE_DEPTH = 2
+
+def _put_latest(q: queue.Queue, item) -> Optional[object]:
+    """Put item without blocking, evicting and returning the oldest entry if full."""
+    try:
+        q.put_nowait(item)
+        return None
+    except queue.Full:
+        try:
+            evicted = q.get_nowait()
+        except queue.Empty:
+            evicted = None
+        q.put_nowait(item)
+        return evicted
+
 class InferenceClient:
     def __init__(
         self,
@@ -12,7 +31,8 @@ class InferenceClient:
         port: int = 5000,
         frame_size: Tuple[int, int] = (320, 240),
         jpeg_quality: int = 40,
-        camera_id: int = 0
+        camera_id: int = 0,
+        use_mjpg: bool = False
     ):
         """Initialize the inference client.
         
@@ -22,11 +42,19 @@ class InferenceClient:
             frame_size: Target frame size (width, height)
             jpeg_quality: JPEG compression quality (1-100)
             camera_id: Camera device ID (default: 0 for primary camera)
+            use_mjpg: Capture MJPG at frame_size and forward the camera's JPEG bytes
+                as-is instead of re-encoding (Linux/V4L2 only; frames that do not
+                fit a datagram are still re-encoded)
         """
         self.logger = logging.getLogger(__name__)
         
         # Initialize components
-        self.video_capture = VideoCapture(camera_id)
+        self.video_capture = VideoCapture(
+            camera_id,
+            use_mjpg=use_mjpg,
+            # Forwarded JPEGs are not resized, so ask the camera for the target size
+            frame_size=frame_size if use_mjpg else None
+        )
         self.udp_client = UDPClient(
             host=host,
             port=port,
@@ -40,6 +68,15 @@ class InferenceClient:
         self.latest_predictions = {}
         self.latest_metrics = {}
 
+        # Pipeline: capture thread -> inference (encode/send/receive) thread -> caller
+        self._frame_queue = queue.Queue(maxsize=PIPELINE_DEPTH)
+        self._result_queue = queue.Queue(maxsize=PIPELINE_DEPTH)
+        self._free_frames = queue.Queue()
+        self._returned_frame = None
+        # Set when either pipeline thread stops on its own, so process_frame can give up
+        self._stage_failed = threading.Event()
+        self._threads = []
+
     def start(self) -> bool:
         """Start the inference client."""
         if self.is_running:
@@ -57,37 +94,118 @@ class InferenceClient:
             self.video_capture.release()
             return False
 
+        # Drop frames and buffers left over from a previous run
+        self._frame_queue = queue.Queue(maxsize=PIPELINE_DEPTH)
+        self._result_queue = queue.Queue(maxsize=PIPELINE_DEPTH)
+        self._free_frames = queue.Queue()
+        self._returned_frame = None
+
+        # Preallocate frame buffers so the capture thread can decode in place
+        width, height = self.video_capture.get_frame_dimensions()
+        if width and height:
+            for _ in range(2):
+                self._free_frames.put(np.empty((height, width, 3), dtype=np.uint8))
+
+        self.prediction_handler.warmup()
+
         self.is_running = True
+        self._stage_failed.clear()
+        self._threads = [
+            threading.Thread(target=self._run_stage, args=(self._capture_loop,), daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._inference_loop,), daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
         self.logger.info("Inference client started successfully")
         return True
 
+    def _recycle(self, frame: Optional[np.ndarray]):
+        """Return a frame buffer to the pool for reuse by the capture thread."""
+        if frame is not None:
+            self._free_frames.put(frame)
+
+    def _run_stage(self, loop):
+        """Run a pipeline loop, flagging the pipeline as failed if it raises."""
+        try:
+            loop()
+        except Exception:
+            self.logger.exception(f"Pipeline stage {loop.__name__} failed")
+            self._stage_failed.set()
+
+    def _capture_loop(self):
+        """Read frames into pooled buffers and hand them to the inference stage."""
+        while self.is_running:
+            try:
+                buffer = self._free_frames.get_nowait()
+            except queue.Empty:
+                buffer = None
+
+            success, frame = self.video_capture.read_frame(buffer)
+            if not success:
+                self.logger.error("Failed to read frame")
+                self._stage_failed.set()
+                return
+
+            evicted = _put_latest(self._frame_queue, (frame, self.video_capture.last_jpeg))
+            if evicted is not None:
+                self._recycle(evicted[0])
+
+    def _inference_loop(self):
+        """Send frames, collect predictions and queue annotated frames for the caller."""
+        while self.is_running:
+            try:
+                frame, jpeg = self._frame_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            # Forward the camera's own JPEG when there is one, else encode the frame
+            sent = jpeg is not None and self.udp_client.send_jpeg(jpeg, frame.nbytes)
+            if sent or self.udp_client.send_frame(frame):
+                # Get prediction
+                success, data = self.udp_client.receive_prediction()
+                if success:
+                    self.latest_predictions = self.prediction_handler.parse_prediction(data)
+                else:
+                    self.logger.debug("No predictions received")
+            else:
+                self.logger.warning("Failed to send frame")
+
+            # Keep drawing the last reply until a newer one arrives. The pipeline
+            # hands each frame to exactly one stage, so draw in place
+            if self.latest_predictions:
+                frame = self.prediction_handler.draw_predictions(frame, self.latest_predictions, inplace=True)
+
+            # Update metrics
+            self.latest_metrics = self.udp_client.get_metrics()
+
+            self._recycle(_put_latest(self._result_queue, frame))
+
     def process_frame(self) -> Tuple[bool, Optional[cv2.Mat]]:
-        """Process a single frame and return the annotated result."""
+        """Return the most recent annotated frame from the pipeline.
+        
+        The returned frame stays valid until the next call, after which its
+        buffer is reused for capture.
+        """
         if not self.is_running:
             self.logger.error("Client is not running")
             return False, None
 
-        # Capture frame
-        success, frame = self.video_capture.read_frame()
-        if not success:
-            self.logger.error("Failed to read frame")
-            return False, None
-
-        # Send frame and get prediction
-        if self.udp_client.send_frame(frame):
-            success, data = self.udp_client.receive_prediction()
-            if success:
-                self.latest_predictions = self.prediction_handler.parse_prediction(data)
-                frame = self.prediction_handler.draw_predictions(frame, self.latest_predictions)
-            else:
-                self.logger.debug("No predictions received")
-        else:
-            self.logger.warning("Failed to send frame")
+        # The previously returned frame is no longer in use by the caller
+        self._recycle(self._returned_frame)
+        self._returned_frame = None
 
-        # Update metrics
-        self.latest_metrics = self.udp_client.get_metrics()
+        while self.is_running:
+            try:
+                frame = self._result_queue.get(timeout=0.1)
+            except queue.Empty:
+                if self._stage_failed.is_set():
+                    return False, None
+                continue
+            self._returned_frame = frame
+            return True, frame
 
-        return True, frame
+        return False, None
 
     def get_metrics(self) -> Dict:
         """Get current performance metrics and prediction summary."""
@@ -101,7 +219,11 @@ class InferenceClient:
         if not self.is_running:
             return
 
+        self.is_running = False
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+
         self.video_capture.release()
         self.udp_client.close()
-        self.is_running = False
         self.logger.info("Inference client stopped")
@@ -0,0 +1,191 @@
+import sys
+import ctypes
+import ctypes.util
+import os
+import errno
+import socket
+import logging
+from typing import Dict, List, Tuple
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [
+        ('iov_base', ctypes.c_void_p),
+        ('iov_len', ctypes.c_size_t),
+    ]
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_name', ctypes.c_void_p),
+        ('msg_namelen', ctypes.c_uint32),
+        ('msg_iov', ctypes.POINTER(_IOVec)),
+        ('msg_iovlen', ctypes.c_size_t),
+        ('msg_control', ctypes.c_void_p),
+        ('msg_controllen', ctypes.c_size_t),
+        ('msg_flags', ctypes.c_int),
+    ]
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_hdr', _MsgHdr),
+        ('msg_len', ctypes.c_uint),
+    ]
+
+class _SockAddrIn(ctypes.Structure):
+    _fields_ = [
+        ('sin_family', ctypes.c_ushort),
+        ('sin_port', ctypes.c_uint16),
+        ('sin_addr', ctypes.c_uint8 * 4),
+        ('sin_zero', ctypes.c_uint8 * 8),
+    ]
+
+def _load_mmsg(name: str, *extra_argtypes):
+    """Return libc's sendmmsg/recvmmsg, or None where it is unavailable (non-Linux)."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fn = getattr(libc, name)
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int, *extra_argtypes]
+    fn.restype = ctypes.c_int
+    return fn
+
+_sendmmsg = _load_mmsg('sendmmsg')
+_recvmmsg = _load_mmsg('recvmmsg', ctypes.c_void_p)
+
+# Block for the first datagram only, then return whatever else is queued
+MSG_WAITFORONE = 0x10000
+
+class SendBatcher:
+    def __init__(self, sock: socket.socket, capacity: int = 64):
+        """Queue UDP datagrams and send them with a single sendmmsg call.
+
+        Args:
+            sock: IPv4 UDP socket to send on
+            capacity: Maximum datagrams per batch (queue flushes when full)
+        """
+        self.socket = sock
+        self.capacity = capacity
+        self.logger = logging.getLogger(__name__)
+
+        # Preallocated message and iovec arrays, reused for every batch
+        self._iov = (_IOVec * capacity)()
+        self._msgs = (_MMsgHdr * capacity)()
+        for i in range(capacity):
+            self._msgs[i].msg_hdr.msg_iov = ctypes.pointer(self._iov[i])
+            self._msgs[i].msg_hdr.msg_iovlen = 1
+
+        self._pending: List[Tuple[bytes, Tuple[str, int]]] = []
+        self._addrs: Dict[Tuple[str, int], _SockAddrIn] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _sockaddr(self, addr: Tuple[str, int]) -> _SockAddrIn:
+        """Resolve and cache the sockaddr_in for a destination."""
+        sa = self._addrs.get(addr)
+        if sa is None:
+            ip, port = socket.getaddrinfo(addr[0], addr[1], socket.AF_INET, socket.SOCK_DGRAM)[0][4]
+            sa = _SockAddrIn()
+            sa.sin_family = socket.AF_INET
+            sa.sin_port = socket.htons(port)
+            sa.sin_addr[:] = socket.inet_aton(ip)
+            self._addrs[addr] = sa
+        return sa
+
+    def add(self, data: bytes, addr: Tuple[str, int]):
+        """Queue a datagram, flushing first if the batch is full."""
+        if len(self._pending) >= self.capacity:
+            self.flush()
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        self._pending.append((data, addr))
+
+    def flush(self) -> int:
+        """Send all queued datagrams.
+
+        Returns:
+            int: Number of datagrams sent
+        """
+        pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+
+        # A single datagram (or no sendmmsg) gains nothing from batching
+        if len(pending) == 1 or _sendmmsg is None:
+            for data, addr in pending:
+                self.socket.sendto(data, addr)
+            return len(pending)
+
+        for i, (data, addr) in enumerate(pending):
+            sa = self._sockaddr(addr)
+            self._iov[i].iov_base = ctypes.cast(ctypes.c_char_p(data), ctypes.c_void_p)
+            self._iov[i].iov_len = len(data)
+            hdr = self._msgs[i].msg_hdr
+            hdr.msg_name = ctypes.addressof(sa)
+            hdr.msg_namelen = ctypes.sizeof(sa)
+
+        sent = 0
+        fd = self.socket.fileno()
+        while sent < len(pending):
+            n = _sendmmsg(fd, ctypes.byref(self._msgs[sent]) if sent else self._msgs,
+                          len(pending) - sent, 0)
+            if n < 0:
+                err = ctypes.get_errno()
+                raise OSError(err, os.strerror(err))
+            sent += n
+        return sent
+
+class RecvBatcher:
+    def __init__(self, sock: socket.socket, capacity: int = 16, buffer_size: int = 65507):
+        """Receive up to capacity UDP datagrams with a single recvmmsg call.
+
+        Args:
+            sock: IPv4 UDP socket to receive on
+            capacity: Maximum datagrams per call
+            buffer_size: Maximum datagram size
+        """
+        self.socket = sock
+        self.capacity = capacity
+        self.buffer_size = buffer_size
+
+        # Preallocated receive buffers, source addresses and message headers
+        self._bufs = [bytearray(buffer_size) for _ in range(capacity)]
+        self._views = [memoryview(buf) for buf in self._bufs]
+        self._iov = (_IOVec * capacity)()
+        self._addrs = (_SockAddrIn * capacity)()
+        self._msgs = (_MMsgHdr * capacity)()
+        for i in range(capacity):
+            self._iov[i].iov_base = ctypes.addressof((ctypes.c_char * buffer_size).from_buffer(self._bufs[i]))
+            self._iov[i].iov_len = buffer_size
+            hdr = self._msgs[i].msg_hdr
+            hdr.msg_iov = ctypes.pointer(self._iov[i])
+            hdr.msg_iovlen = 1
+            hdr.msg_name = ctypes.addressof(self._addrs[i])
+
+    def recv(self) -> List[Tuple[bytes, Tuple[str, int]]]:
+        """Block until at least one datagram arrives and return all that are queued.
+
+        Returns:
+            List[Tuple[bytes, Tuple[str, int]]]: (data, addr) pairs in arrival order
+        """
+        if _recvmmsg is None:
+            data, addr = self.socket.recvfrom(self.buffer_size)
+            return [(data, addr)]
+
+        for i in range(self.capacity):
+            self._msgs[i].msg_hdr.msg_namelen = ctypes.sizeof(_SockAddrIn)
+        n = _recvmmsg(self.socket.fileno(), self._msgs, self.capacity, MSG_WAITFORONE, None)
+        if n < 0:
+            err = ctypes.get_errno()
+            if err == errno.EINTR:
+                return []
+            raise OSError(err, os.strerror(err))
+
+        received = []
+        for i in range(n):
+            sa = self._addrs[i]
+            addr = (socket.inet_ntoa(bytes(sa.sin_addr)), socket.ntohs(sa.sin_port))
+            received.append((bytes(self._views[i][:self._msgs[i].msg_len]), addr))
+        return received
@@ -1,12 +1,68 @@
 import cv2
+import sys
+import errno
 import time
 import socket
+import struct
 import logging
+import selectors
 import numpy as np
-from typing import Optional, Tuple, Dict
-from collections import deque
+from typing import Optional, Tuple, Dict, Union
+from .send_batcher import SendBatcher
+from .uring_backend import UringBackend
+from ..utils.framing import CHUNK_PAYLOAD, split_frame
+from ..utils.jpeg import JPEG_BACKEND, encode_jpeg
+
+# Granularity of the JPEG quality search
+QUALITY_STEP = 5
+
+# Skip the adaptive search when p95 frame size is below this fraction of buffer_size
+FAST_PATH_FILL = 0.7
+
+# Frames at least this large (VGA) are resized through CUDA or OpenCL when
+# available, below it the fixed upload/UMat cost outweighs the gain
+OPENCL_MIN_PIXELS = 640 * 480
+
+# Non-blocking receive flag (the socket is non-blocking anyway where this is missing)
+_MSG_DONTWAIT = getattr(socket, 'MSG_DONTWAIT', 0)
+
+# Linux UDP generic segmentation offload: one send is split into equal-sized
+# datagrams by the kernel (or NIC), limited to 64 segments per call
+UDP_SEGMENT = getattr(socket, 'UDP_SEGMENT', 103)
+GSO_MAX_SEGMENTS = 64
+# Send errors meaning GSO itself is unavailable (no checksum offload, old kernel)
+GSO_UNSUPPORTED_ERRNOS = (errno.EIO, errno.EINVAL, errno.ENOPROTOOPT, errno.EOPNOTSUPP)
+
+# Number of recent frames the metrics are computed over
+METRICS_WINDOW = 100
+_SIZE, _COMPRESSION, _TIME = range(3)
+
+# Indices into the array returned by UDPClient.metrics_view()
+(METRIC_FRAME_SIZE, METRIC_COMPRESSION, METRIC_PROCESS_TIME, METRIC_FPS,
+ METRIC_QUALITY, METRIC_FRAMES_SENT, METRIC_BYTES_SENT) = range(7)
+
+# Kernel socket buffer size requested for bursts of large datagrams
+SOCKET_BUFFER_SIZE = 8 << 20
+
+# Set DF and never fragment locally (Linux values where the socket module lacks them).
+# Only applied to MTU-sized fragment datagrams; a 64KB datagram would be rejected
+IP_MTU_DISCOVER = getattr(socket, 'IP_MTU_DISCOVER', 10)
+IP_PMTUDISC_DO = getattr(socket, 'IP_PMTUDISC_DO', 2)
+
+# DSCP EF (expedited forwarding) for low-latency delivery
+IP_TOS_LOW_DELAY = 0xB8
 
 class UDPClient:
+    __slots__ = (
+        'host', 'port', 'buffer_size', 'initial_jpeg_quality', 'min_jpeg_quality',
+        'target_size', 'fragment_frames', 'chunk_size', 'socket_buffer_size', 'socket', 'logger',
+        'use_uring', 'uring_zero_copy', '_selector', '_batcher', '_uring', '_gso',
+        '_opencl', '_cuda', '_gpu_frame', '_gpu_resized', '_resize_buf', '_scratch',
+        '_frame_id', '_rx_buf', '_rx_view',
+        '_ema_quality', 'last_quality', '_p95_size', '_m', '_m_idx', '_sums', '_metrics_view',
+        'last_metrics_time', 'frames_sent', 'bytes_sent',
+    )
+
     def __init__(
         self, 
         host: str = 'localhost', 
@@ -14,7 +70,12 @@ class UDPClient:
         buffer_size: int = 65507,
         initial_jpeg_quality: int = 60,
         min_jpeg_quality: int = 30,
-        target_size: Optional[Tuple[int, int]] = None
+        target_size: Optional[Tuple[int, int]] = None,
+        fragment_frames: bool = False,
+        chunk_size: int = CHUNK_PAYLOAD,
+        use_uring: bool = False,
+        uring_zero_copy: bool = False,
+        socket_buffer_size: int = SOCKET_BUFFER_SIZE
     ):
         """Initialize UDP client for sending frames.
         
@@ -25,6 +86,15 @@ class UDPClient:
             initial_jpeg_quality: Starting JPEG quality (0-100)
             min_jpeg_quality: Minimum JPEG quality before resizing
             target_size: Optional (width, height) to resize frames to
+            fragment_frames: Split each frame across chunk_size datagrams at a fixed
+                quality instead of shrinking it to fit a single datagram. The server
+                must reassemble frames (see utils.framing)
+            chunk_size: Payload bytes per datagram when fragmenting
+            use_uring: Send and receive through io_uring when liburing is available
+                (Linux only), falling back to plain socket calls otherwise
+            uring_zero_copy: Send large datagrams with io_uring zero-copy sends
+                (kernel 6.0+); worthwhile on real NICs, slower over loopback
+            socket_buffer_size: Requested SO_SNDBUF/SO_RCVBUF size in bytes
         """
         self.host = host
         self.port = port
@@ -32,13 +102,51 @@ class UDPClient:
         self.initial_jpeg_quality = initial_jpeg_quality
         self.min_jpeg_quality = min_jpeg_quality
         self.target_size = target_size
+        self.fragment_frames = fragment_frames
+        self.chunk_size = chunk_size
+        self.use_uring = use_uring
+        self.uring_zero_copy = uring_zero_copy
+        self.socket_buffer_size = socket_buffer_size
         self.socket = None
+        self._selector = None
+        self._batcher = None
+        self._uring = None
+        self._gso = sys.platform.startswith('linux')
         self.logger = logging.getLogger(__name__)
+
+        self._opencl = cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+        self._cuda = self._has_cuda()
+        # Device buffers reused across frames (allocated on first upload/resize)
+        self._gpu_frame = cv2.cuda_GpuMat() if self._cuda else None
+        self._gpu_resized = cv2.cuda_GpuMat() if self._cuda else None
+
+        # Resize destination reused for every frame, and a flat scratch buffer
+        # reused by the scale-down retry path
+        self._resize_buf = None
+        self._scratch = None
+        if target_size:
+            self._resize_buf = np.empty((target_size[1], target_size[0], 3), dtype=np.uint8)
+            self._scratch = np.empty(target_size[0] * target_size[1] * 3, dtype=np.uint8)
+        
+        self._frame_id = 0
+
+        # Receive buffer reused for every datagram
+        self._rx_buf = bytearray(buffer_size)
+        self._rx_view = memoryview(self._rx_buf)
+
+        # Adaptive quality state
+        self._ema_quality = float(initial_jpeg_quality)
+        self.last_quality = initial_jpeg_quality
+        self._p95_size = float('inf')
         
         # Monitoring metrics
-        self.frame_sizes = deque(maxlen=100)
-        self.compression_rates = deque(maxlen=100)
-        self.frame_times = deque(maxlen=100)
+        # Ring buffer of the last METRICS_WINDOW frames: rows are size, compression, time
+        self._m = np.zeros((3, METRICS_WINDOW), dtype=np.float32)
+        self._m_idx = 0
+        # Running column sums of the ring buffer, so averages are O(1) per frame
+        self._sums = np.zeros(3, dtype=np.float64)
+        # Current metrics, updated in place per frame (see metrics_view)
+        self._metrics_view = np.zeros(7, dtype=np.float64)
         self.last_metrics_time = time.time()
         self.frames_sent = 0
         self.bytes_sent = 0
@@ -47,110 +155,312 @@ class UDPClient:
         """Create UDP socket."""
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._tune_socket()
+            self.socket.setblocking(False)
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self.socket, selectors.EVENT_READ)
+            self._batcher = SendBatcher(self.socket)
+            if self.use_uring:
+                self._connect_uring()
+            self.logger.info(f"JPEG encoder: {JPEG_BACKEND}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to create UDP socket: {e}")
             return False
 
+    def _connect_uring(self):
+        """Swap socket calls for io_uring submissions when the platform supports it."""
+        if not UringBackend.available():
+            self.logger.info("io_uring unavailable, using socket calls")
+            return
+        try:
+            # io_uring send/recv carry no address, so fix the peer on the socket
+            self.socket.connect((self.host, self.port))
+            self._uring = UringBackend(self.socket, zero_copy=self.uring_zero_copy)
+            self.logger.info("Using io_uring for UDP send/receive")
+        except OSError as e:
+            self.logger.warning(f"Failed to set up io_uring, using socket calls: {e}")
+            self._uring = None
+
+    def _tune_socket(self):
+        """Enlarge kernel buffers and mark packets low-latency (best effort)."""
+        options = [
+            (socket.SOL_SOCKET, socket.SO_REUSEADDR, 1),
+            (socket.SOL_SOCKET, socket.SO_SNDBUF, self.socket_buffer_size),
+            (socket.SOL_SOCKET, socket.SO_RCVBUF, self.socket_buffer_size),
+            (socket.IPPROTO_IP, socket.IP_TOS, IP_TOS_LOW_DELAY),
+        ]
+        if self.fragment_frames and sys.platform.startswith('linux'):
+            options.append((socket.IPPROTO_IP, IP_MTU_DISCOVER, IP_PMTUDISC_DO))
+        for level, option, value in options:
+            try:
+                self.socket.setsockopt(level, option, value)
+            except OSError as e:
+                self.logger.warning(f"Could not set socket option {option}: {e}")
+
+        # The kernel may clamp (or on Linux double) the requested sizes
+        sndbuf = self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+        rcvbuf = self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        self.logger.info(f"Socket buffers: send={sndbuf/1024:.0f}KB, receive={rcvbuf/1024:.0f}KB")
+
     def _resize_frame(self, frame: np.ndarray, scale_factor: float) -> np.ndarray:
         """Resize frame by a scale factor."""
         if scale_factor >= 1.0:
             return frame
-        new_size = (int(frame.shape[1] * scale_factor), int(frame.shape[0] * scale_factor))
-        return cv2.resize(frame, new_size, interpolation=cv2.INTER_AREA)
+        w, h = int(frame.shape[1] * scale_factor), int(frame.shape[0] * scale_factor)
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        if self._scratch is None or self._scratch.size < h * w * channels:
+            self._scratch = np.empty(frame.shape[0] * frame.shape[1] * channels, dtype=np.uint8)
+        shape = (h, w, channels) if frame.ndim == 3 else (h, w)
+        dst = self._scratch[:h * w * channels].reshape(shape)
+        return self._resize(frame, (w, h), dst)
 
-    def _compress_frame(self, frame: np.ndarray, quality: int) -> Tuple[bool, bytes]:
+    @staticmethod
+    def _has_cuda() -> bool:
+        """Whether this OpenCV build has CUDA support and a device to run it on."""
+        try:
+            return cv2.cuda.getCudaEnabledDeviceCount() > 0
+        except (AttributeError, cv2.error):
+            return False
+
+    def _resize(self, frame: np.ndarray, size: Tuple[int, int], dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """Resize with INTER_AREA, offloading large frames to CUDA or OpenCL when available."""
+        if self._cuda and frame.shape[0] * frame.shape[1] >= OPENCL_MIN_PIXELS:
+            self._gpu_frame.upload(frame)
+            cv2.cuda.resize(self._gpu_frame, size, dst=self._gpu_resized, interpolation=cv2.INTER_AREA)
+            # Only the downscaled frame crosses back over the bus
+            return self._gpu_resized.download(dst) if dst is not None else self._gpu_resized.download()
+        if self._opencl and frame.shape[0] * frame.shape[1] >= OPENCL_MIN_PIXELS:
+            return cv2.resize(cv2.UMat(frame), size, interpolation=cv2.INTER_AREA).get()
+        return cv2.resize(frame, size, dst=dst, interpolation=cv2.INTER_AREA)
+
+    def _compress_frame(self, frame: np.ndarray, quality: int) -> Tuple[bool, Union[bytes, memoryview]]:
         """Compress frame with given JPEG quality."""
         try:
-            _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
-            data = buffer.tobytes()
-            return True, data
+            return True, encode_jpeg(frame, quality)
         except Exception as e:
             self.logger.error(f"Compression error: {e}")
             return False, b""
 
-    def send_frame(self, frame: np.ndarray) -> bool:
-        """Send a frame over UDP with adaptive compression."""
+    def _encode_to_fit(self, frame: np.ndarray, quality: int) -> Tuple[bool, Union[bytes, memoryview], int]:
+        """Encode at the given quality, bisecting down towards min_jpeg_quality on overflow.
+
+        Returns:
+            Tuple[bool, Union[bytes, memoryview], int]: (success, data, accepted quality)
+        """
+        success, data = self._compress_frame(frame, quality)
+        if not success or len(data) <= self.buffer_size:
+            return success, data, quality
+
+        lo, hi = self.min_jpeg_quality, quality - 1
+        best, best_quality = None, lo
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            success, candidate = self._compress_frame(frame, mid)
+            if not success:
+                return False, b"", mid
+            if len(candidate) <= self.buffer_size:
+                best, best_quality = candidate, mid
+                lo = mid + QUALITY_STEP
+            else:
+                hi = mid - QUALITY_STEP
+
+        if best is None:
+            return False, b"", self.min_jpeg_quality
+        return True, best, best_quality
+
+    def send_frame(self, frame: np.ndarray, quality: Optional[int] = None) -> bool:
+        """Send a frame over UDP with adaptive compression.
+
+        Args:
+            frame: BGR frame to send
+            quality: Per-frame quality ceiling (e.g. from a content-complexity
+                estimate), used in place of initial_jpeg_quality for this frame
+        """
         if self.socket is None:
             self.logger.error("Socket not initialized")
             return False
 
         start_time = time.time()
         original_size = frame.shape[0] * frame.shape[1] * frame.shape[2]
-        current_frame = frame.copy()
+        if quality is None:
+            ceiling = self.initial_jpeg_quality
+        else:
+            ceiling = min(100, max(self.min_jpeg_quality, int(quality)))
         
         try:
-            # If target size is set, resize first
+            # If target size is set, resize first into the reused buffer (the
+            # caller's frame is never modified, so no copy is needed)
             if self.target_size:
-                current_frame = cv2.resize(current_frame, self.target_size, interpolation=cv2.INTER_AREA)
+                work = self._resize(frame, self.target_size, dst=self._resize_buf)
+            else:
+                work = frame
+            current_frame = work
+
+            if self.fragment_frames:
+                return self._send_fragmented(current_frame, start_time, original_size, ceiling)
             
-            # Start with initial quality
-            current_quality = self.initial_jpeg_quality
-            scale_factor = 1.0
+            # Steady state: recent frames fit comfortably, so a single encode normally suffices
             success = False
+            if (self._p95_size < FAST_PATH_FILL * self.buffer_size
+                    and self.last_quality == ceiling):
+                start_quality = current_quality = ceiling
+                success, data = self._compress_frame(current_frame, start_quality)
+                success = success and len(data) <= self.buffer_size
+
+            if not success:
+                # Start from the learned quality rather than the fixed initial one
+                start_quality = max(self.min_jpeg_quality, min(ceiling, round(self._ema_quality)))
+            scale_factor = 1.0
             
             while not success and scale_factor > 0.3:
-                # Try current quality
-                while current_quality >= self.min_jpeg_quality:
-                    success, data = self._compress_frame(current_frame, current_quality)
-                    if not success:
-                        break
-                        
-                    if len(data) <= self.buffer_size:
-                        # Successfully compressed to acceptable size
-                        success = True
-                        break
-                    
-                    # Reduce quality and try again
-                    current_quality -= 5
-                
+                success, data, current_quality = self._encode_to_fit(current_frame, start_quality)
                 if success:
                     break
                     
                 # If quality reduction didn't work, scale down the image
                 scale_factor *= 0.8
-                current_frame = self._resize_frame(current_frame, scale_factor)
-                current_quality = self.initial_jpeg_quality  # Reset quality for new size
+                current_frame = self._resize_frame(work, scale_factor)
             
             if not success:
                 self.logger.warning("Could not reduce frame to fit UDP packet")
                 return False
             
             # Send the frame
-            self.socket.sendto(data, (self.host, self.port))
-            
-            # Update metrics
-            process_time = time.time() - start_time
-            self.frame_sizes.append(len(data))
-            self.compression_rates.append(len(data) / original_size)
-            self.frame_times.append(process_time)
-            self.frames_sent += 1
-            self.bytes_sent += len(data)
-            
-            # Log metrics every second
-            if time.time() - self.last_metrics_time > 1.0:
-                self._log_metrics()
-                self.last_metrics_time = time.time()
+            self._transmit(data)
+
+            # Frames that fit first time pull the estimate back up towards the ceiling
+            observed = ceiling if current_quality == start_quality else current_quality
+            self._ema_quality = 0.9 * self._ema_quality + 0.1 * observed
+            self.last_quality = current_quality
             
+            self._record_metrics(len(data), original_size, start_time)
             return True
             
         except Exception as e:
             self.logger.error(f"Error sending frame: {e}")
             return False
 
+    def _send_fragmented(self, frame: np.ndarray, start_time: float, original_size: int, quality: int) -> bool:
+        """Encode once at the given quality and send the frame as MTU-sized chunks."""
+        success, data = self._compress_frame(frame, quality)
+        if not success:
+            return False
+
+        self._transmit(data)
+        self.last_quality = quality
+
+        self._record_metrics(len(data), original_size, start_time)
+        return True
+
+    def send_jpeg(self, data: bytes, original_size: int) -> bool:
+        """Send an already JPEG-encoded frame (e.g. raw MJPG from the camera) as-is.
+        
+        Args:
+            data: JPEG bytes
+            original_size: Size in bytes of the uncompressed frame, for compression metrics
+        """
+        if self.socket is None:
+            self.logger.error("Socket not initialized")
+            return False
+        if not self.fragment_frames and len(data) > self.buffer_size:
+            self.logger.warning("Encoded frame does not fit UDP packet")
+            return False
+
+        start_time = time.time()
+        try:
+            self._transmit(data)
+            self._record_metrics(len(data), original_size, start_time)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error sending frame: {e}")
+            return False
+
+    def _transmit(self, data: Union[bytes, memoryview]):
+        """Send encoded frame bytes, split into chunks when fragmenting."""
+        if self.fragment_frames:
+            datagrams = split_frame(self._frame_id, data, self.chunk_size)
+            self._frame_id = (self._frame_id + 1) & 0xFFFFFFFF
+            if self._gso and self._uring is None and len(datagrams) > 1:
+                try:
+                    self._send_gso(datagrams)
+                    return
+                except OSError as e:
+                    # Anything else (e.g. EAGAIN on the non-blocking socket) is a failed send
+                    if e.errno not in GSO_UNSUPPORTED_ERRNOS:
+                        raise
+                    self.logger.warning(f"UDP GSO unsupported, falling back to sendmmsg: {e}")
+                    self._gso = False
+        elif self._uring is None:
+            # One datagram: send straight from the encoder's buffer, no batching or copy
+            self.socket.sendto(data, (self.host, self.port))
+            return
+        else:
+            datagrams = [data]
+
+        if self._uring is not None:
+            # The liburing binding only accepts bytes objects
+            self._uring.send([d if isinstance(d, bytes) else bytes(d) for d in datagrams])
+            return
+
+        addr = (self.host, self.port)
+        for datagram in datagrams:
+            self._batcher.add(datagram, addr)
+        self._batcher.flush()
+
+    def _send_gso(self, datagrams: list):
+        """Send equal-sized chunks (last may be shorter) as GSO super-datagrams."""
+        segment_size = len(datagrams[0])
+        per_send = min(GSO_MAX_SEGMENTS, self.buffer_size // segment_size)
+        ancillary = [(socket.IPPROTO_UDP, UDP_SEGMENT, struct.pack('=H', segment_size))]
+        addr = (self.host, self.port)
+        for start in range(0, len(datagrams), per_send):
+            # Chunks are passed as separate iovecs, so they are never joined in Python
+            self.socket.sendmsg(datagrams[start:start + per_send], ancillary, 0, addr)
+
+    def _record_metrics(self, frame_size: int, original_size: int, start_time: float):
+        """Record a sent frame and log metrics every second."""
+        process_time = time.time() - start_time
+        column = self._m[:, self._m_idx % METRICS_WINDOW]
+        self._sums -= column
+        column[:] = (frame_size, frame_size / original_size, process_time)
+        self._sums += column
+        self._m_idx += 1
+        self.frames_sent += 1
+        self.bytes_sent += frame_size
+        
+        view = self._metrics_view
+        view[METRIC_FRAME_SIZE:METRIC_PROCESS_TIME + 1] = self._sums / min(self._m_idx, METRICS_WINDOW)
+        view[METRIC_FPS] = 1.0 / view[METRIC_PROCESS_TIME] if view[METRIC_PROCESS_TIME] > 0 else 0.0
+        view[METRIC_QUALITY] = self.last_quality
+        view[METRIC_FRAMES_SENT] = self.frames_sent
+        view[METRIC_BYTES_SENT] = self.bytes_sent
+        
+        # Refresh the size percentile and log metrics every second
+        if time.time() - self.last_metrics_time > 1.0:
+            window = self._window()
+            self._p95_size = float(np.percentile(window[_SIZE], 95))
+            # Resynchronize the running sums so rounding error cannot accumulate
+            window.sum(axis=1, dtype=np.float64, out=self._sums)
+            self._log_metrics()
+            self.last_metrics_time = time.time()
+
+    def _window(self) -> np.ndarray:
+        """View of the filled part of the metrics ring buffer."""
+        return self._m[:, :min(self._m_idx, METRICS_WINDOW)]
+
     def _log_metrics(self):
         """Log current performance metrics."""
-        if not self.frame_times:
+        window = self._window()
+        if not window.shape[1]:
             return
             
-        avg_frame_size = sum(self.frame_sizes) / len(self.frame_sizes)
-        avg_compression = sum(self.compression_rates) / len(self.compression_rates)
-        avg_process_time = sum(self.frame_times) / len(self.frame_times)
+        avg_frame_size, avg_compression, avg_process_time = window.mean(axis=1).tolist()
         fps = 1.0 / avg_process_time if avg_process_time > 0 else 0
         
         # Calculate min/max frame sizes
-        min_frame_size = min(self.frame_sizes) / 1024  # KB
-        max_frame_size = max(self.frame_sizes) / 1024  # KB
+        min_frame_size = float(window[_SIZE].min()) / 1024  # KB
+        max_frame_size = float(window[_SIZE].max()) / 1024  # KB
         avg_frame_size_kb = avg_frame_size / 1024
         
         self.logger.info(
@@ -158,41 +468,86 @@ class UDPClient:
             f"  - FPS: {fps:.1f}\n"
             f"  - Frame Sizes (KB): min={min_frame_size:.1f}, avg={avg_frame_size_kb:.1f}, max={max_frame_size:.1f}\n"
             f"  - Compression Ratio: {avg_compression:.3f}\n"
-            f"  - JPEG Quality: {self.initial_jpeg_quality}\n"
+            f"  - JPEG Quality: {self.last_quality}\n"
             f"  - Buffer Usage: {(avg_frame_size/self.buffer_size)*100:.1f}%"
         )
 
     def get_metrics(self) -> Dict:
         """Get current performance metrics."""
-        if not self.frame_times:
+        if not self.frames_sent:
             return {}
             
+        avg_frame_size, avg_compression, avg_process_time = (
+            self._metrics_view[METRIC_FRAME_SIZE:METRIC_PROCESS_TIME + 1].tolist())
         return {
-            'avg_frame_size': sum(self.frame_sizes) / len(self.frame_sizes),
-            'avg_compression': sum(self.compression_rates) / len(self.compression_rates),
-            'avg_process_time': sum(self.frame_times) / len(self.frame_times),
-            'current_quality': self.initial_jpeg_quality,
+            'avg_frame_size': avg_frame_size,
+            'avg_compression': avg_compression,
+            'avg_process_time': avg_process_time,
+            'current_quality': self.last_quality,
             'frames_sent': self.frames_sent,
             'bytes_sent': self.bytes_sent
         }
 
-    def receive_prediction(self) -> Tuple[bool, Optional[bytes]]:
-        """Receive prediction data from server."""
+    def metrics_view(self) -> np.ndarray:
+        """Get current performance metrics without allocating.
+        
+        Returns:
+            np.ndarray: Array indexed by the METRIC_* constants, updated in place
+                as frames are sent (all zeros before the first frame). Read it,
+                do not modify or keep it expecting a snapshot.
+        """
+        return self._metrics_view
+
+    def receive_prediction(self, timeout: float = 0.0) -> Tuple[bool, Optional[bytes]]:
+        """Receive the newest prediction from the server, discarding stale ones.
+        
+        Args:
+            timeout: Seconds to wait for a reply (0 polls without blocking)
+        """
         if self.socket is None:
             return False, None
 
         try:
-            data, _ = self.socket.recvfrom(self.buffer_size)
-            return True, data
-        except socket.timeout:
-            self.logger.debug("Receive timeout")
-            return False, None
+            # Poll first without a select() round trip; only wait if nothing is queued
+            nbytes = self._drain()
+            if nbytes is None and timeout > 0 and self._selector.select(timeout):
+                nbytes = self._drain()
+            if nbytes is None:
+                self.logger.debug("No prediction pending")
+                return False, None
+            return True, bytes(self._rx_view[:nbytes])
         except Exception as e:
             self.logger.error(f"Error receiving prediction: {e}")
             return False, None
 
+    def _drain(self) -> Optional[int]:
+        """Read every queued datagram into the receive buffer.
+        
+        Each datagram overwrites the previous one, so the buffer ends up holding
+        only the newest.
+        
+        Returns:
+            Optional[int]: Size of the newest datagram, or None if nothing was queued
+        """
+        nbytes = None
+        while True:
+            try:
+                if self._uring is not None:
+                    nbytes = self._uring.recv_into(self._rx_buf)
+                else:
+                    nbytes, _ = self.socket.recvfrom_into(self._rx_buf, self.buffer_size, _MSG_DONTWAIT)
+            except BlockingIOError:
+                return nbytes
+
     def close(self):
         """Close the UDP socket."""
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        self._batcher = None
+        if self._uring is not None:
+            self._uring.close()
+            self._uring = None
         if self.socket is not None:
             self.socket.close()
             self.socket = None
@@ -1,15 +1,31 @@
 import cv2
+import sys
 import logging
+import numpy as np
 from typing import Optional, Tuple, Union
+from ..utils.jpeg import decode_jpeg
 
 class VideoCapture:
-    def __init__(self, source: Union[int, str] = 0):
+    def __init__(
+        self,
+        source: Union[int, str] = 0,
+        use_mjpg: bool = False,
+        frame_size: Optional[Tuple[int, int]] = None
+    ):
         """Initialize video capture from webcam or video file.
         
         Args:
             source: Camera index (int) or video file path (str). Default is 0 (primary webcam).
+            use_mjpg: Request MJPG from the camera via V4L2 (Linux only) so frames arrive
+                already JPEG-encoded and can be forwarded without re-encoding (see last_jpeg)
+            frame_size: Optional (width, height) to request from the camera
         """
         self.source = source
+        self.use_mjpg = use_mjpg
+        self.frame_size = frame_size
+        self.raw_mjpg = False
+        # Undecoded MJPG bytes of the last retrieved frame (None unless raw_mjpg)
+        self.last_jpeg = None
         self.cap = None
         self.logger = logging.getLogger(__name__)
 
@@ -20,31 +36,100 @@ class VideoCapture:
             bool: True if capture started successfully, False otherwise.
         """
         try:
-            self.cap = cv2.VideoCapture(self.source)
+            mjpg = self.use_mjpg and isinstance(self.source, int) and sys.platform.startswith('linux')
+            if mjpg:
+                self.cap = cv2.VideoCapture(self.source, cv2.CAP_V4L2)
+            else:
+                self.cap = cv2.VideoCapture(self.source)
             if not self.cap.isOpened():
                 self.logger.error(f"Failed to open video source: {self.source}")
                 return False
+
+            if mjpg:
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+            if self.frame_size:
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_size[0])
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_size[1])
+            if mjpg:
+                # Ask the backend to hand back the undecoded MJPG buffer
+                self.raw_mjpg = bool(self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0))
             return True
         except Exception as e:
             self.logger.error(f"Error starting video capture: {e}")
             return False
 
-    def read_frame(self) -> Tuple[bool, Optional[cv2.Mat]]:
+    def read_frame(self, out: Optional[np.ndarray] = None) -> Tuple[bool, Optional[cv2.Mat]]:
         """Read a frame from the video source.
         
+        Args:
+            out: Optional preallocated array to decode into (reallocated if the shape differs)
+        
         Returns:
             Tuple[bool, Optional[cv2.Mat]]: (success, frame) pair
         """
+        if not self.grab():
+            return False, None
+        return self.retrieve(out)
+
+    def grab(self) -> bool:
+        """Capture the next frame without decoding it.
+        
+        Pair with retrieve(). Splitting the two lets callers skip decoding
+        frames they will not use, or grab several cameras before decoding any.
+        
+        Returns:
+            bool: True if a frame was grabbed
+        """
+        if self.cap is None:
+            return False
+        if not self.cap.grab():
+            self.logger.warning("Failed to grab frame")
+            return False
+        return True
+
+    def retrieve(self, out: Optional[np.ndarray] = None) -> Tuple[bool, Optional[cv2.Mat]]:
+        """Decode the frame captured by the last grab().
+        
+        Args:
+            out: Optional preallocated array to decode into (reallocated if the shape differs)
+        
+        Returns:
+            Tuple[bool, Optional[cv2.Mat]]: (success, frame) pair
+        """
+        self.last_jpeg = None
         if self.cap is None:
             return False, None
         
-        ret, frame = self.cap.read()
+        if self.raw_mjpg:
+            ret, buffer = self.cap.retrieve()
+            if not ret or buffer is None:
+                self.logger.warning("Failed to read frame")
+                return False, None
+            if self._is_raw_mjpg(buffer):
+                data = buffer.tobytes()
+                frame = decode_jpeg(data)
+                if frame is None:
+                    return False, None
+                # Kept so the frame can be forwarded without re-encoding
+                self.last_jpeg = data
+                return True, frame
+            # The backend decoded the frame after all: use it and stop expecting raw buffers
+            self.logger.warning("Backend did not return a raw MJPG buffer, decoding in OpenCV")
+            self.raw_mjpg = False
+            return True, buffer
+
+        ret, frame = self.cap.retrieve(out)
         if not ret:
             self.logger.warning("Failed to read frame")
             return False, None
         
         return True, frame
 
+    @staticmethod
+    def _is_raw_mjpg(buffer: np.ndarray) -> bool:
+        """Raw MJPG comes back as a single row of bytes; anything else was decoded."""
+        return buffer.ndim == 2 and buffer.shape[0] == 1
+
     def get_frame_dimensions(self) -> Tuple[int, int]:
         """Get the dimensions of the video frames.
         
@@ -0,0 +1,24 @@
+# Optional Numba-compiled helpers for PredictionHandler.draw_predictions
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _compute_boxes(coords, width, height, label_height):
+    """Convert normalized (x, y, w, h) rows to int32 (x1, y1, x2, y2, y1_label) rows."""
+    n = coords.shape[0]
+    boxes = np.empty((n, 5), dtype=np.int32)
+    for i in range(n):
+        half_w = coords[i, 2] / 2
+        half_h = coords[i, 3] / 2
+        boxes[i, 0] = int((coords[i, 0] - half_w) * width)
+        boxes[i, 1] = int((coords[i, 1] - half_h) * height)
+        boxes[i, 2] = int((coords[i, 0] + half_w) * width)
+        boxes[i, 3] = int((coords[i, 1] + half_h) * height)
+        boxes[i, 4] = max(boxes[i, 1], label_height)
+    return boxes
+
+# cache=True keeps the compiled kernel on disk so the LLVM cost is paid once
+compute_boxes = njit(cache=True, fastmath=True)(_compute_boxes) if njit is not None else None
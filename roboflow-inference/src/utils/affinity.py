@@ -0,0 +1,85 @@
+import os
+import re
+import sys
+import socket
+import logging
+from typing import Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Preferred-CPU hint for a socket (Linux 3.19+, missing from older Pythons)
+SO_INCOMING_CPU = getattr(socket, 'SO_INCOMING_CPU', 49)
+
+# /proc/interrupts action names used by common NIC drivers for their queue IRQs
+NIC_IRQ_PATTERN = re.compile(r'eth|en[ops]\d|wl|mlx|ixgbe|i40e|ice|bnxt|TxRx|virtio\d+-(input|rx)')
+
+def find_nic_core() -> Optional[int]:
+    """Find the CPU that services the NIC's receive interrupts.
+
+    The NIC_CORE environment variable takes precedence. Otherwise the CPU with
+    the most NIC queue interrupts in /proc/interrupts is used.
+
+    Returns:
+        Optional[int]: CPU index, or None if it cannot be determined
+    """
+    env = os.environ.get('NIC_CORE')
+    if env is not None:
+        try:
+            return int(env)
+        except ValueError:
+            logger.warning(f"Ignoring invalid NIC_CORE={env!r}")
+
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        with open('/proc/interrupts') as f:
+            cpu_count = len(f.readline().split())
+            totals = [0] * cpu_count
+            for line in f:
+                fields = line.split()
+                if len(fields) <= cpu_count or not NIC_IRQ_PATTERN.search(fields[-1]):
+                    continue
+                for cpu, count in enumerate(fields[1:cpu_count + 1]):
+                    if count.isdigit():
+                        totals[cpu] += int(count)
+    except OSError:
+        return None
+
+    if not any(totals):
+        return None
+    return max(range(cpu_count), key=totals.__getitem__)
+
+def pin_current_thread(cores: Union[int, Iterable[int]]) -> bool:
+    """Restrict the calling thread to one CPU or a set of CPUs (Linux only, best effort).
+
+    Threads started afterwards inherit the restriction.
+
+    Returns:
+        bool: Whether the affinity was applied
+    """
+    if not hasattr(os, 'sched_setaffinity'):
+        return False
+    cores = {cores} if isinstance(cores, int) else set(cores)
+    try:
+        # On Linux pid 0 means the calling thread, not the whole process
+        os.sched_setaffinity(0, cores)
+        return True
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not pin thread to CPUs {sorted(cores)}: {e}")
+        return False
+
+def set_incoming_cpu(sock: socket.socket, core: int) -> bool:
+    """Record core as the socket's preferred CPU (best effort).
+
+    This is only a hint: packet processing stays wherever RSS/RPS put it, and
+    for UDP the SO_REUSEPORT hash, not this value, picks the receiving socket.
+
+    Returns:
+        bool: Whether the option was applied
+    """
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_INCOMING_CPU, core)
+        return True
+    except OSError as e:
+        logger.warning(f"Could not set SO_INCOMING_CPU to {core}: {e}")
+        return False
@@ -0,0 +1,27 @@
+import cv2
+import numpy as np
+
+# Maximum dHash Hamming distance at which two frames count as unchanged
+DHASH_SKIP_DISTANCE = 5
+
+def dhash(frame: np.ndarray) -> int:
+    """Compute a 64-bit difference hash of a BGR frame.
+
+    Each bit records whether a pixel of the 9x8 grayscale thumbnail is brighter
+    than its left neighbour, so the hash survives noise and recompression but
+    changes when the scene does.
+    """
+    thumb = cv2.resize(frame, (9, 8), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+    bits = np.packbits(gray[:, 1:] > gray[:, :-1])
+    return int(bits.view(np.uint64)[0])
+
+if hasattr(int, 'bit_count'):
+    def hamming(a: int, b: int) -> int:
+        """Number of differing bits between two hashes."""
+        return (a ^ b).bit_count()
+else:
+    # int.bit_count is Python 3.10+
+    def hamming(a: int, b: int) -> int:
+        """Number of differing bits between two hashes."""
+        return bin(a ^ b).count('1')
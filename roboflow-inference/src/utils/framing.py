@@ -0,0 +1,68 @@
+import struct
+from typing import Dict, List, Optional
+
+# Per-datagram header: frame_id, chunk_idx, chunk_count
+HDR = struct.Struct('<IHH')
+
+# Payload bytes per datagram, small enough to stay under a typical 1500-byte MTU
+CHUNK_PAYLOAD = 1400
+
+def split_frame(frame_id: int, data: bytes, payload_size: int = CHUNK_PAYLOAD) -> List[bytes]:
+    """Split an encoded frame into header-prefixed datagrams.
+
+    Args:
+        frame_id: Sequence number identifying the frame (wraps at 2**32)
+        data: Encoded frame bytes
+        payload_size: Maximum payload bytes per datagram
+
+    Returns:
+        List[bytes]: Datagrams ready to send, in chunk order
+    """
+    view = memoryview(data)
+    chunk_count = max(1, -(-len(view) // payload_size))
+    frame_id &= 0xFFFFFFFF
+    return [
+        HDR.pack(frame_id, idx, chunk_count) + view[idx * payload_size:(idx + 1) * payload_size]
+        for idx in range(chunk_count)
+    ]
+
+class FrameReassembler:
+    def __init__(self, max_pending: int = 4):
+        """Rebuild frames from datagrams produced by split_frame.
+
+        Args:
+            max_pending: Incomplete frames kept before the oldest is dropped
+        """
+        self.max_pending = max_pending
+        self._pending: Dict[int, List[Optional[bytes]]] = {}
+        self._received: Dict[int, int] = {}
+        self.frames_dropped = 0
+
+    def add(self, datagram: bytes) -> Optional[bytes]:
+        """Add a datagram and return the frame it completes, if any."""
+        if len(datagram) < HDR.size:
+            return None
+        frame_id, chunk_idx, chunk_count = HDR.unpack_from(datagram)
+        if chunk_idx >= chunk_count:
+            return None
+
+        chunks = self._pending.get(frame_id)
+        if chunks is None:
+            if len(self._pending) >= self.max_pending:
+                # Dict preserves insertion order, so the first key is the oldest frame
+                oldest = next(iter(self._pending))
+                del self._pending[oldest]
+                self._received.pop(oldest, None)
+                self.frames_dropped += 1
+            chunks = self._pending[frame_id] = [None] * chunk_count
+        if chunk_idx >= len(chunks):
+            return None
+        if chunks[chunk_idx] is None:
+            chunks[chunk_idx] = datagram[HDR.size:]
+            self._received[frame_id] = self._received.get(frame_id, 0) + 1
+
+        if self._received[frame_id] < chunk_count:
+            return None
+        del self._pending[frame_id]
+        del self._received[frame_id]
+        return b"".join(chunks)
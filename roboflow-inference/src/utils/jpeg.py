@@ -0,0 +1,47 @@
+import cv2
+import numpy as np
+from typing import Optional, Union
+
+# Prefer a direct libjpeg-turbo binding over cv2.imencode/imdecode: it works
+# straight on the BGR array without OpenCV's colour swap and output vector copy.
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    _TJ = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _TJ = None
+
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+# Name of the codec encode_jpeg/decode_jpeg will use, for logging
+JPEG_BACKEND = 'turbojpeg' if _TJ is not None else 'simplejpeg' if simplejpeg is not None else 'opencv'
+
+def encode_jpeg(frame: np.ndarray, quality: int) -> Union[bytes, memoryview]:
+    """Encode a BGR frame as JPEG with 4:2:0 chroma subsampling.
+
+    The OpenCV fallback returns a memoryview over imencode's output array
+    rather than copying it into a new bytes object.
+    """
+    frame = np.ascontiguousarray(frame)
+    if _TJ is not None:
+        return _TJ.encode(frame, quality=quality, pixel_format=TJPF_BGR,
+                          jpeg_subsample=TJSAMP_420)
+    if simplejpeg is not None:
+        return simplejpeg.encode_jpeg(frame, quality=quality, colorspace='BGR',
+                                      colorsubsampling='420')
+    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return memoryview(buffer.reshape(-1))
+
+def decode_jpeg(data: bytes) -> Optional[np.ndarray]:
+    """Decode JPEG bytes to a BGR frame (None if the data is not a valid JPEG)."""
+    try:
+        if _TJ is not None:
+            return _TJ.decode(data, pixel_format=TJPF_BGR)
+        if simplejpeg is not None:
+            return simplejpeg.decode_jpeg(data, colorspace='BGR')
+        return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    except Exception:
+        # The libjpeg-turbo bindings raise on corrupt data (common with webcam MJPG)
+        return None
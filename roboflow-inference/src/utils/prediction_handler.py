@@ -1,7 +1,22 @@
 import cv2
 import json
+import zlib
 import numpy as np
-from typing import Dict, List, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from ._draw_kernels import compute_boxes
+
+# orjson parses bytes directly and is considerably faster than the stdlib decoder
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Maximum number of rendered label tiles kept in the LRU cache
+LABEL_CACHE_SIZE = 256
+
+# Use the compiled box kernel (when numba is installed) above this many predictions
+NUMBA_MIN_BOXES = 16
 
 class PredictionHandler:
     def __init__(self):
@@ -10,11 +25,29 @@ class PredictionHandler:
         self.font = cv2.FONT_HERSHEY_SIMPLEX
         self.font_scale = 0.5
         self.thickness = 2
+        self._label_cache: "OrderedDict[Tuple[str, float], np.ndarray]" = OrderedDict()
+        # Hershey text height depends only on font, scale and thickness
+        (_, self._label_height), _ = cv2.getTextSize("0", self.font, self.font_scale, self.thickness)
+        # Stacked coordinates of the last drawn result, which is usually drawn on several frames
+        self._coords_for: Tuple[Optional[List[Dict]], Optional[np.ndarray]] = (None, None)
+
+    def warmup(self):
+        """Compile the numba box kernel (if installed) so the first frame does not pay for it."""
+        if compute_boxes is not None:
+            compute_boxes(np.zeros((1, 4), dtype=np.float32), 1, 1, self._label_height)
+
+    @staticmethod
+    def _coords(preds: List[Dict]) -> np.ndarray:
+        """Stack predictions' normalized (x, y, w, h) into an (N, 4) float32 array."""
+        return np.array(
+            [(p.get('x', 0), p.get('y', 0), p.get('width', 0), p.get('height', 0)) for p in preds],
+            dtype=np.float32
+        ).reshape(-1, 4)
 
     def parse_prediction(self, data: bytes) -> Dict:
         """Parse prediction data from bytes to dictionary."""
         try:
-            return json.loads(data.decode('utf-8'))
+            return _json_loads(data)
         except json.JSONDecodeError as e:
             print(f"Error parsing prediction: {e}")
             return {}
@@ -24,48 +57,91 @@ class PredictionHandler:
 
     def _get_color(self, class_name: str) -> Tuple[int, int, int]:
         """Get consistent color for a class."""
-        if class_name not in self.colors:
-            # Generate random color for new class
-            self.colors[class_name] = tuple(np.random.randint(0, 255, 3).tolist())
-        return self.colors[class_name]
+        color = self.colors.get(class_name)
+        if color is None:
+            # Derive color from a stable hash so classes look the same across runs
+            h = zlib.crc32(class_name.encode('utf-8')) & 0xFFFFFF
+            color = self.colors[class_name] = (h & 0xFF, (h >> 8) & 0xFF, (h >> 16) & 0xFF)
+        return color
+
+    def _get_label_tile(self, class_name: str, confidence: float) -> np.ndarray:
+        """Get the rendered label patch for a class/confidence pair, rendering on a cache miss."""
+        key = (class_name, round(confidence, 2))
+        tile = self._label_cache.get(key)
+        if tile is not None:
+            self._label_cache.move_to_end(key)
+            return tile
+
+        label = f"{class_name}: {confidence:.2f}"
+        label_size, _ = cv2.getTextSize(label, self.font, self.font_scale, self.thickness)
+        # Same footprint as the filled label rectangle: text height plus 5px below the baseline
+        tile = np.empty((label_size[1] + 6, label_size[0] + 1, 3), dtype=np.uint8)
+        tile[:] = self._get_color(class_name)
+        cv2.putText(tile, label, (0, label_size[1]),
+                   self.font, self.font_scale, (255, 255, 255), 1)
+
+        self._label_cache[key] = tile
+        if len(self._label_cache) > LABEL_CACHE_SIZE:
+            self._label_cache.popitem(last=False)
+        return tile
 
-    def draw_predictions(self, frame: np.ndarray, predictions: Dict) -> np.ndarray:
-        """Draw predictions on frame."""
+    @staticmethod
+    def _blit(frame: np.ndarray, tile: np.ndarray, x: int, y: int):
+        """Copy tile onto frame with its top-left corner at (x, y), clipped to the frame."""
+        tile_h, tile_w = tile.shape[:2]
+        frame_h, frame_w = frame.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + tile_w, frame_w), min(y + tile_h, frame_h)
+        if x0 < x1 and y0 < y1:
+            frame[y0:y1, x0:x1] = tile[y0 - y:y1 - y, x0 - x:x1 - x]
+
+    def draw_predictions(self, frame: np.ndarray, predictions: Dict, inplace: bool = False) -> np.ndarray:
+        """Draw predictions on frame.
+        
+        Args:
+            frame: BGR frame to annotate
+            predictions: Parsed prediction dictionary
+            inplace: Draw directly on frame instead of a copy (caller must own the frame)
+        """
         if not predictions or 'predictions' not in predictions:
             return frame
 
+        preds = predictions['predictions']
+        if not preds:
+            return frame
+
         frame_height, frame_width = frame.shape[:2]
-        annotated_frame = frame.copy()
+        annotated_frame = frame if inplace else frame.copy()
 
-        for pred in predictions['predictions']:
-            # Extract prediction data
-            x = pred.get('x', 0)
-            y = pred.get('y', 0)
-            width = pred.get('width', 0)
-            height = pred.get('height', 0)
-            class_name = pred.get('class', 'unknown')
-            confidence = pred.get('confidence', 0)
-
-            # Convert normalized coordinates to pixel coordinates
-            x1 = int((x - width/2) * frame_width)
-            y1 = int((y - height/2) * frame_height)
-            x2 = int((x + width/2) * frame_width)
-            y2 = int((y + height/2) * frame_height)
-
-            # Get color for class
-            color = self._get_color(class_name)
-
-            # Draw bounding box
-            cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, self.thickness)
-
-            # Draw label
-            label = f"{class_name}: {confidence:.2f}"
-            label_size, _ = cv2.getTextSize(label, self.font, self.font_scale, self.thickness)
-            y1_label = max(y1, label_size[1])
-            cv2.rectangle(annotated_frame, (x1, y1_label - label_size[1]),
-                        (x1 + label_size[0], y1_label + 5), color, -1)
-            cv2.putText(annotated_frame, label, (x1, y1_label),
-                       self.font, self.font_scale, (255, 255, 255), 1)
+        # Convert normalized coordinates to pixel corners in one vectorized pass
+        cached_preds, coords = self._coords_for
+        if cached_preds is not preds or len(coords) != len(preds):
+            coords = self._coords(preds)
+            self._coords_for = (preds, coords)
+        if compute_boxes is not None and len(preds) > NUMBA_MIN_BOXES:
+            boxes = compute_boxes(coords, frame_width, frame_height, self._label_height)
+        else:
+            centers, half_sizes = coords[:, :2], coords[:, 2:] / 2
+            corners = np.hstack((centers - half_sizes, centers + half_sizes))
+            corners *= np.array([frame_width, frame_height, frame_width, frame_height], dtype=np.float32)
+            boxes = np.empty((len(preds), 5), dtype=np.int32)
+            boxes[:, :4] = corners
+            np.maximum(boxes[:, 1], self._label_height, out=boxes[:, 4])
+
+        # Draw all bounding boxes of a class with one polylines call
+        contours = boxes[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape(-1, 4, 2)
+        class_names = [pred.get('class', 'unknown') for pred in preds]
+        by_class: Dict[str, List[int]] = {}
+        for i, class_name in enumerate(class_names):
+            by_class.setdefault(class_name, []).append(i)
+        for class_name, indices in by_class.items():
+            cv2.polylines(annotated_frame, contours[indices], True,
+                          self._get_color(class_name), self.thickness)
+
+        for pred, class_name, (x1, _, _, _, y1_label) in zip(preds, class_names, boxes.tolist()):
+            # Draw label from the cached tile
+            tile = self._get_label_tile(class_name, pred.get('confidence', 0))
+            self._blit(annotated_frame, tile, x1, y1_label - self._label_height)
 
         return annotated_frame
 
@@ -1,91 +1,223 @@
+import os
 import cv2
 import sys
 import socket
 import logging
-import threading
+import multiprocessing
 import time
 import json
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 # Add src to Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from src.client.video_capture import VideoCapture
-from src.client.udp_client import UDPClient
+from src.client.udp_client import (
+    IP_MTU_DISCOVER, IP_PMTUDISC_DO, METRIC_COMPRESSION, METRIC_FPS, METRIC_FRAME_SIZE,
+    METRIC_FRAMES_SENT, METRIC_QUALITY, UDPClient,
+)
+from src.client.send_batcher import RecvBatcher, SendBatcher
 from src.utils.prediction_handler import PredictionHandler
+from src.utils.framing import FrameReassembler
+from src.utils.frame_hash import DHASH_SKIP_DISTANCE, dhash, hamming
+from src.utils.affinity import find_nic_core, pin_current_thread, set_incoming_cpu
 
-def run_test_server(host='localhost', port=5000):
-    """Run a simple UDP echo server for testing."""
+# Split frames across MTU-sized datagrams instead of shrinking them to one packet
+FRAGMENT_FRAMES = False
+
+# Kernel buffer sizes for the client and test server sockets, so bursts are not dropped
+CLIENT_SOCKET_BUFFER = 8 << 20
+SERVER_SOCKET_BUFFER = 8 << 20
+
+# Test server processes sharing the port through SO_REUSEPORT. For each
+# datagram the kernel picks one of them by hashing the sender's address and
+# port, so this single-client test only ever reaches one process. Raise it
+# when several clients stream at once (needs SO_REUSEPORT)
+SERVER_PROCESSES = 1
+
+# Set DF on the server's replies so they are never fragmented (Linux only)
+SERVER_PMTU_DISCOVER = sys.platform.startswith('linux')
+
+# Content-adaptive quality: busy frames mask compression artifacts, flat ones
+# show blocking, so quality falls as the Laplacian variance of a 64x64
+# grayscale thumbnail rises. QMAP is indexed by variance // COMPLEXITY_BIN.
+MIN_QUALITY, MAX_QUALITY = 20, 40
+COMPLEXITY_BIN = 16
+QMAP = np.interp(
+    np.arange(256) * COMPLEXITY_BIN, [0, 300, 1500, 4000], [MAX_QUALITY, 36, 28, MIN_QUALITY]
+).astype(np.uint8)
+# Re-estimate complexity every N frames to amortize the Laplacian
+QUALITY_INTERVAL = 4
+# Back off quality when average frames fill this much of a datagram
+HIGH_WATER_FILL = 0.8
+QUALITY_BACKOFF = 5
+
+# Resend an unchanged scene at least this often so predictions stay fresh
+MAX_SKIPPED_FRAMES = 30
+
+# pollKey never waits; a real waitKey every this many frames keeps HighGUI's
+# event loop pumping on platforms that need it (macOS)
+WAITKEY_INTERVAL = 30
+
+# Metrics panel covering (10, 10)-(400, 170) inclusive: the static labels are
+# rendered once into LABEL_SPRITE and only the values are drawn per refresh
+METRICS_FONT = cv2.FONT_HERSHEY_SIMPLEX
+METRIC_LABELS = (
+    "FPS:", "Frame Size:", "Buffer Usage:", "Compression:",
+    "Quality:", "Total Frames:", "Predictions:",
+)
+LABEL_SPRITE = np.zeros((161, 391, 3), dtype=np.uint8)
+for _i, _label in enumerate(METRIC_LABELS):
+    cv2.putText(LABEL_SPRITE, _label, (10, 20 + 20 * _i), METRICS_FONT, 0.6, (255, 255, 255), 1)
+# Sprite x where each value starts: just after its label and a space
+VALUE_X = tuple(10 + cv2.getTextSize(label + " ", METRICS_FONT, 0.6, 1)[0][0] for label in METRIC_LABELS)
+
+# Seconds between metrics panel refreshes (faster updates are unreadable anyway)
+METRICS_INTERVAL = 0.1
+
+def run_test_server(host='localhost', port=5000, core=None, reuse_port=False):
+    """Run a simple UDP echo server for testing, optionally pinned to one CPU.
+    
+    With reuse_port, several servers (one per process) can bind the same address.
+    """
     server_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    if reuse_port:
+        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SERVER_SOCKET_BUFFER)
+    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SERVER_SOCKET_BUFFER)
+    if SERVER_PMTU_DISCOVER:
+        server_socket.setsockopt(socket.IPPROTO_IP, IP_MTU_DISCOVER, IP_PMTUDISC_DO)
+    if core is not None:
+        pin_current_thread(core)
+        # Only a CPU hint recorded on the socket: the reuseport hash alone decides
+        # which server process receives a datagram
+        set_incoming_cpu(server_socket, core)
     server_socket.bind((host, port))
     print(f"Test server listening on {host}:{port}")
+    # The mock prediction never changes, so serialize it once
+    mock_prediction = {
+        "predictions": [
+            {
+                "x": 0.5,
+                "y": 0.5,
+                "width": 0.3,
+                "height": 0.4,
+                "class": "person",
+                "confidence": 0.95
+            }
+        ]
+    }
+    response = json.dumps(mock_prediction).encode('utf-8')
+    
+    reassembler = FrameReassembler() if FRAGMENT_FRAMES else None
+    receiver = RecvBatcher(server_socket)
+    sender = SendBatcher(server_socket)
     
     try:
         while True:
-            data, addr = server_socket.recvfrom(65507)
-            print(f"Received {len(data)} bytes")
-            
-            # Send back a mock prediction
-            mock_prediction = {
-                "predictions": [
-                    {
-                        "x": 0.5,
-                        "y": 0.5,
-                        "width": 0.3,
-                        "height": 0.4,
-                        "class": "person",
-                        "confidence": 0.95
-                    }
-                ]
-            }
-            response = json.dumps(mock_prediction).encode('utf-8')
-            server_socket.sendto(response, addr)
+            # Drain all queued datagrams with one recvmmsg, reply with one sendmmsg
+            for data, addr in receiver.recv():
+                if reassembler is not None:
+                    data = reassembler.add(data)
+                    if data is None:
+                        continue
+                print(f"Received {len(data)} bytes")
+                
+                # Send back a mock prediction
+                sender.add(response, addr)
+            sender.flush()
     except KeyboardInterrupt:
         print("Server stopping...")
     finally:
         server_socket.close()
 
-def display_metrics(frame, metrics, prediction_summary="No predictions"):
-    """Display metrics on the frame."""
-    if not metrics:
-        return frame
-    
-    # Create a copy of the frame
-    frame_with_metrics = frame.copy()
-    
-    # Add black background for text
-    cv2.rectangle(frame_with_metrics, (10, 10), (400, 170), (0, 0, 0), -1)
-    
-    # Add metrics text
-    font = cv2.FONT_HERSHEY_SIMPLEX
-    y_pos = 30
-    white = (255, 255, 255)
-    
-    fps = 1.0 / metrics['avg_process_time'] if metrics['avg_process_time'] > 0 else 0
-    metrics_text = [
-        f"FPS: {fps:.1f}",
-        f"Frame Size: {metrics['avg_frame_size']/1024:.1f}KB",
-        f"Buffer Usage: {(metrics['avg_frame_size']/65507)*100:.1f}%",
-        f"Compression: {metrics['avg_compression']:.3f}",
-        f"Quality: {metrics['current_quality']}",
-        f"Total Frames: {metrics['frames_sent']}",
-        f"Predictions: {prediction_summary}"
-    ]
+def estimate_quality(frame):
+    """Pick a JPEG quality for the frame from its texture complexity."""
+    thumb = cv2.resize(frame, (64, 64), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+    complexity = cv2.Laplacian(gray, cv2.CV_16S).var()
+    return int(QMAP[min(int(complexity) // COMPLEXITY_BIN, len(QMAP) - 1)])
+
+@lru_cache(maxsize=1)
+def render_metrics_panel(fps, frame_size_kb, buffer_usage, compression, quality, frames_sent, prediction_summary):
+    """Render the metrics panel, reusing it while the displayed values are unchanged."""
+    values = (
+        f"{fps:.1f}",
+        f"{frame_size_kb:.1f}KB",
+        f"{buffer_usage:.1f}%",
+        f"{compression:.3f}",
+        f"{quality}",
+        f"{frames_sent}",
+        f"{prediction_summary}",
+    )
+    panel = LABEL_SPRITE.copy()
+    for i, (x, text) in enumerate(zip(VALUE_X, values)):
+        cv2.putText(panel, text, (x, 20 + 20 * i), METRICS_FONT, 0.6, (255, 255, 255), 1)
+    return panel
+
+def metrics_panel(metrics, prediction_summary="No predictions"):
+    """Build the metrics panel from UDPClient.metrics_view() (None before any frame is sent)."""
+    fps, frame_size, compression, quality, frames_sent = metrics[
+        [METRIC_FPS, METRIC_FRAME_SIZE, METRIC_COMPRESSION, METRIC_QUALITY, METRIC_FRAMES_SENT]
+    ].tolist()
+    if not frames_sent:
+        return None
     
-    for text in metrics_text:
-        cv2.putText(frame_with_metrics, text, (20, y_pos), font, 0.6, white, 1)
-        y_pos += 20
+    return render_metrics_panel(
+        round(fps, 1),
+        round(frame_size / 1024, 1),
+        round((frame_size / 65507) * 100, 1),
+        round(compression, 3),
+        int(quality),
+        int(frames_sent),
+        prediction_summary
+    )
+
+def display_metrics(frame, panel):
+    """Copy the metrics panel onto the frame in place (the frame is not reused afterwards)."""
+    if panel is None:
+        return frame
     
-    return frame_with_metrics
+    # Slice copy, clipped to the frame
+    region = frame[10:171, 10:401]
+    region[:] = panel[:region.shape[0], :region.shape[1]]
+    return frame
 
 def main():
     # Set up logging
     logging.basicConfig(level=logging.INFO)
     
-    # Start test server in a separate thread
-    server_thread = threading.Thread(target=run_test_server)
-    server_thread.daemon = True
-    server_thread.start()
+    # Keep the client on the CPU that takes the NIC interrupts and the servers
+    # on the CPUs after it, so the ping-pong does not migrate between cores
+    nic_core = find_nic_core()
+    server_cores = [None] * SERVER_PROCESSES
+    parse_cpus = None
+    if nic_core is not None:
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else [nic_core]
+        others = [cpu for cpu in cpus if cpu > nic_core] + [cpu for cpu in cpus if cpu < nic_core]
+        others = others or [nic_core]
+        # The parse worker is started after the main thread is pinned, so give it
+        # the other CPUs explicitly rather than inheriting the one-CPU mask
+        parse_cpus = others
+        server_cores = [others[i % len(others)] for i in range(SERVER_PROCESSES)]
+        print(f"Pinning client to CPU {nic_core}, servers to CPUs {server_cores}")
+    
+    # Start the test servers in separate processes sharing the port
+    servers = [
+        multiprocessing.Process(
+            target=run_test_server,
+            kwargs={'core': core, 'reuse_port': SERVER_PROCESSES > 1},
+            daemon=True
+        )
+        for core in server_cores
+    ]
+    for server in servers:
+        server.start()
+    if nic_core is not None:
+        pin_current_thread(nic_core)
     
     # Initialize components
     cap = VideoCapture()
@@ -97,17 +229,39 @@ def main():
     print(f"Original frame dimensions: {width}x{height}")
     
     client = UDPClient(
-        initial_jpeg_quality=40,
-        min_jpeg_quality=20,
-        target_size=(320, 240)
+        initial_jpeg_quality=MAX_QUALITY,
+        min_jpeg_quality=MIN_QUALITY,
+        target_size=(320, 240),
+        fragment_frames=FRAGMENT_FRAMES,
+        socket_buffer_size=CLIENT_SOCKET_BUFFER
     )
     
     if not client.connect():
         print("Failed to create UDP socket")
         cap.release()
         return
+    if nic_core is not None:
+        set_incoming_cpu(client.socket, nic_core)
 
     prediction_handler = PredictionHandler()
+    prediction_handler.warmup()
+    
+    # Parse replies off the capture loop; the newest finished result is drawn
+    parse_pool = ThreadPoolExecutor(
+        max_workers=1,
+        initializer=pin_current_thread if parse_cpus else None,
+        initargs=(parse_cpus,) if parse_cpus else ()
+    )
+    pending_parse = None
+    last_predictions = {}
+    frame_count = 0
+    quality = MAX_QUALITY
+    # Updated in place by the client, so it is fetched once
+    metrics = client.metrics_view()
+    panel = None
+    last_panel_ts = 0.0
+    sent_hash = None
+    frames_skipped = 0
     
     try:
         while True:
@@ -117,34 +271,65 @@ def main():
                 print("Failed to read frame")
                 break
             
-            # Send frame
-            if client.send_frame(frame):
+            # Choose quality from frame content, backing off as datagrams fill up
+            if frame_count % QUALITY_INTERVAL == 0:
+                quality = estimate_quality(frame)
+                if metrics[METRIC_FRAME_SIZE] > HIGH_WATER_FILL * 65507:
+                    quality = max(MIN_QUALITY, quality - QUALITY_BACKOFF)
+            frame_count += 1
+            
+            # Skip encoding and sending when the scene matches the last sent frame
+            frame_hash = dhash(frame)
+            if (sent_hash is not None and frames_skipped < MAX_SKIPPED_FRAMES
+                    and hamming(frame_hash, sent_hash) <= DHASH_SKIP_DISTANCE):
+                frames_skipped += 1
+                send_failed = False
+            else:
+                # Send frame
+                send_failed = not client.send_frame(frame, quality=quality)
+                if not send_failed:
+                    sent_hash, frames_skipped = frame_hash, 0
+            if not send_failed:
                 # Receive prediction
                 success, data = client.receive_prediction()
                 if success:
-                    predictions = prediction_handler.parse_prediction(data)
-                    frame = prediction_handler.draw_predictions(frame, predictions)
-                    prediction_summary = prediction_handler.get_prediction_summary(predictions)
-                else:
-                    prediction_summary = "No predictions received"
+                    pending_parse = parse_pool.submit(prediction_handler.parse_prediction, data)
+            
+            # Pick up the parsed result once the worker has finished it
+            if pending_parse is not None and pending_parse.done():
+                last_predictions = pending_parse.result()
+                pending_parse = None
+            
+            if last_predictions:
+                frame = prediction_handler.draw_predictions(frame, last_predictions, inplace=True)
+                prediction_summary = prediction_handler.get_prediction_summary(last_predictions)
             else:
+                prediction_summary = "No predictions received"
+            if send_failed:
                 prediction_summary = "Failed to send frame"
             
-            # Get and display metrics
-            metrics = client.get_metrics()
-            frame_with_metrics = display_metrics(frame, metrics, prediction_summary)
+            # Display metrics
+            now = time.time()
+            if now - last_panel_ts >= METRICS_INTERVAL:
+                panel = metrics_panel(metrics, prediction_summary)
+                last_panel_ts = now
+            frame_with_metrics = display_metrics(frame, panel)
             
             # Display the frame
             cv2.imshow('UDP Streaming Test', frame_with_metrics)
             
             # Press 'q' to quit
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            key = cv2.waitKey(1) if frame_count % WAITKEY_INTERVAL == 0 else cv2.pollKey()
+            if key != -1 and key & 0xFF == ord('q'):
                 break
     
     finally:
+        parse_pool.shutdown(wait=False)
         cap.release()
         client.close()
         cv2.destroyAllWindows()
+        for server in servers:
+            server.terminate()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
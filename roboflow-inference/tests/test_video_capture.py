@@ -8,6 +8,10 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from src.client.video_capture import VideoCapture
 
+# pollKey never waits; a real waitKey every this many frames keeps HighGUI's
+# event loop pumping on platforms that need it (macOS)
+WAITKEY_INTERVAL = 30
+
 def main():
     # Set up logging
     logging.basicConfig(level=logging.INFO)
@@ -21,6 +25,7 @@ def main():
     
     print(f"Video dimensions: {cap.get_frame_dimensions()}")
     
+    frame_count = 0
     try:
         while True:
             success, frame = cap.read_frame()
@@ -32,8 +37,10 @@ def main():
             cv2.imshow('Video Test', frame)
             
             # Press 'q' to quit
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            key = cv2.waitKey(1) if frame_count % WAITKEY_INTERVAL == 0 else cv2.pollKey()
+            if key != -1 and key & 0xFF == ord('q'):
                 break
+            frame_count += 1
     
     finally:
         cap.release()